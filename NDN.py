@@ -10,6 +10,7 @@ import shutil
 
 import numpy as np
 import tensorflow as tf
+from tensorflow.core.protobuf import rewriter_config_pb2
 
 from .regularization import OutputRegularization
 from .ffnetwork import FFNetwork
@@ -1450,13 +1451,17 @@ class NDN(object):
         """
 
         if learning_alg == 'adam':
-            # self.train_step = tf.compat.v1.train.AdamOptimizer(  # not backwards compatible
-            self.train_step = tf.train.AdamOptimizer(
+            # optimizer = tf.compat.v1.train.AdamOptimizer(  # not backwards compatible
+            optimizer = tf.train.AdamOptimizer(
                 learning_rate=opt_params['learning_rate'],
                 beta1=opt_params['beta1'],
                 beta2=opt_params['beta2'],
-                epsilon=opt_params['epsilon']). \
-                minimize(self.cost_penalized, var_list=var_list)
+                epsilon=opt_params['epsilon'])
+            if opt_params['mixed_precision']:
+                # dynamic loss scaling for float16 compute (the rewrite itself is enabled in the
+                # training session's config)
+                optimizer = tf.train.experimental.MixedPrecisionLossScaleOptimizer(optimizer, 'dynamic')
+            self.train_step = optimizer.minimize(self.cost_penalized, var_list=var_list)
         elif learning_alg == 'lbfgs':
             self.train_step = tf.contrib.opt.ScipyOptimizerInterface(
                 self.cost_penalized,
@@ -1617,7 +1622,15 @@ class NDN(object):
             batch_size=opt_params['batch_size'],
             use_dropout=use_dropout)
 
-        with tf.Session(graph=self.graph, config=self.sess_config) as sess:
+        # float16 graph rewrite only applies to the training session
+        train_config = self.sess_config
+        if learning_alg == 'adam' and opt_params['mixed_precision']:
+            train_config = tf.ConfigProto()
+            train_config.CopyFrom(self.sess_config)
+            train_config.graph_options.rewrite_options.auto_mixed_precision = \
+                rewriter_config_pb2.RewriterConfig.ON
+
+        with tf.Session(graph=self.graph, config=train_config) as sess:
             # handle output directories
             train_writer = None
             test_writer = None
@@ -2796,6 +2809,11 @@ class NDN(object):
             opt_params['epsilon'] (float, optional): epsilon parameter in
                 Adam optimizer
                 DEFAULT: 1e-4 (note normal Adam default is 1e-8)
+            opt_params['mixed_precision'] (bool, optional): `True` to let adam
+                compute in float16 (keeping float32 weights and using dynamic
+                loss scaling). Mainly speeds up training on GPUs with Tensor
+                Cores, and requires tensorflow >= 1.14. Only affects training.
+                DEFAULT: `False`
             opt_params['epochs_summary'] (int, optional): number of epochs
                 between saving network summary information.
                 DEFAULT: `None`
@@ -2846,6 +2864,11 @@ class NDN(object):
                 opt_params['epsilon'] = 1e-8
             if 'run_diagnostics' not in opt_params:
                 opt_params['run_diagnostics'] = False
+            if 'mixed_precision' not in opt_params:
+                opt_params['mixed_precision'] = False
+            if opt_params['mixed_precision'] and \
+                    not hasattr(getattr(tf.train, 'experimental', None), 'MixedPrecisionLossScaleOptimizer'):
+                raise ValueError('mixed_precision requires tensorflow >= 1.14')
 
         else:  # lbfgs
             if 'maxiter' not in opt_params:
@@ -3,9 +3,481 @@
 from __future__ import print_function
 from __future__ import division
 
+from collections import namedtuple
+from contextlib import ExitStack
+
+import numpy as np
 import tensorflow as tf
-from .layer import *
-from .tlayer import *
+from copy import deepcopy
+from .layer import (
+    Layer, SepLayer, ReadoutLayer, AddLayer, MultLayer, Dim0Layer, FilterLayer, SpkNL_Layer,
+    SpikeHistoryLayer, ConvLayer, ConvDiffOfGaussiansLayer, ConvReadoutLayer, DiffOfGaussiansLayer,
+    ConvXYLayer, ConvSepLayer, HadiReadoutLayer, BiConvLayer, ConvLayerLNL, VariableLayer,
+    BiasRegLayer, MaskLayer, DeconvLayer)
+from .tlayer import TLayer, TLayerSpecific
+
+# Per-layer network_params entries that can be given as a single value, with their defaults
+_SCALAR_DEFAULTS = (
+    ('activation_funcs', 'relu'),
+    ('weights_initializers', 'trunc_normal'),
+    ('biases_initializers', 'zeros'),
+    ('num_inh', 0),
+    ('pos_constraints', False))
+
+# Per-layer settings shared by the layer builders, gathered from network_params once per layer
+_LayerConfig = namedtuple('_LayerConfig', [
+    'activation_func', 'weights_initializer', 'biases_initializer', 'reg_initializer',
+    'num_inh', 'pos_constraint', 'normalize_weights', 'num_lags', 'log_activations'])
+
+
+def _conv_filter_size(layer_size, width, fold_extra_dims=True):
+    """Filter dimensions for a convolutional layer with given input size and filter width (None
+    for full-size filters). Input dimensions beyond the third (i.e. lags) are folded into the first
+    if fold_extra_dims is set."""
+    if width is None:
+        return layer_size
+
+    dim0size = layer_size[0]
+    if fold_extra_dims:
+        for extra_dim in layer_size[3:]:
+            dim0size *= extra_dim
+
+    conv_filter_size = [dim0size, width, 1]
+    if layer_size[2] > 1:
+        conv_filter_size[2] = width
+    return conv_filter_size
+
+
+def _build_normal(nn, layer_sizes, network_params, c):
+    return Layer(
+        scope='layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_sep(nn, layer_sizes, network_params, c):
+    return SepLayer(
+        scope='sep_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_readout(nn, layer_sizes, network_params, c):
+    return ReadoutLayer(
+        scope='readout_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn + 1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_add(nn, layer_sizes, network_params, c):
+    return AddLayer(
+        scope='add_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_mult(nn, layer_sizes, network_params, c):
+    return MultLayer(
+        scope='mult_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_dim0(nn, layer_sizes, network_params, c):
+    return Dim0Layer(
+        scope='dim0_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_filter(nn, layer_sizes, network_params, c):
+    return FilterLayer(
+        scope='add_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_spkNL(nn, layer_sizes, network_params, c):
+    return SpkNL_Layer(
+        scope='spkNL_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        log_activations=c.log_activations)
+
+
+def _build_spike_history(nn, layer_sizes, network_params, c):
+    return SpikeHistoryLayer(
+        scope='spike_history_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_conv(nn, layer_sizes, network_params, c):
+
+    conv_filter_size = _conv_filter_size(layer_sizes[nn], network_params['conv_filter_widths'][nn])
+    return ConvLayer(
+        scope='conv_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn+1],
+        filter_dims=conv_filter_size,
+        shift_spacing=network_params['shift_spacing'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_conv_diff_of_gaussians(nn, layer_sizes, network_params, c):
+
+    conv_filter_size = _conv_filter_size(layer_sizes[nn], network_params['conv_filter_widths'][nn])
+    return ConvDiffOfGaussiansLayer(
+        scope='conv_dog_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn+1],
+        bounds=network_params['bounds'][nn] if 'bounds' in network_params else None,
+        filter_dims=conv_filter_size,
+        shift_spacing=network_params['shift_spacing'][nn],
+        activation_func=c.activation_func,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        num_inh=c.num_inh,
+        log_activations=c.log_activations)
+
+
+def _build_temporal(nn, layer_sizes, network_params, c):
+    return TLayer(
+        scope='temporal_layer_%i' % nn,
+        num_lags=c.num_lags,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn + 1],
+        dilation=network_params['dilation'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_sp_temporal(nn, layer_sizes, network_params, c):
+    return TLayerSpecific(
+        scope='sp_temporal_layer_%i' % nn,
+        num_lags=c.num_lags,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn + 1],
+        dilation=network_params['dilation'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_conv_readout(nn, layer_sizes, network_params, c):
+    return ConvReadoutLayer(
+        scope='conv_readout_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn + 1],
+        xy_out=network_params['xy_out'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_diff_of_gaussians(nn, layer_sizes, network_params, c):
+    return DiffOfGaussiansLayer(
+        scope='diff_of_gaussians_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn + 1],
+        bounds=network_params['bounds'][nn] if 'bounds' in network_params else None,
+        activation_func=c.activation_func,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        num_inh=c.num_inh,
+        log_activations=c.log_activations)
+
+
+def _build_conv_xy(nn, layer_sizes, network_params, c):
+
+    if network_params['conv_filter_widths'][nn] is not None:
+        width = network_params['conv_filter_widths'][nn]
+        conv_filter_size = [layer_sizes[nn][0], width, width]
+    else:
+        conv_filter_size = layer_sizes[nn]
+
+    return ConvXYLayer(
+        scope='conv_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn + 1],
+        filter_dims=conv_filter_size,
+        xy_out=network_params['xy_out'][nn],
+        shift_spacing=network_params['shift_spacing'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_convsep(nn, layer_sizes, network_params, c):
+
+    conv_filter_size = _conv_filter_size(
+        layer_sizes[nn], network_params['conv_filter_widths'][nn], fold_extra_dims=False)
+    return ConvSepLayer(
+        scope='sepconv_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn+1],
+        filter_dims=conv_filter_size,
+        shift_spacing=network_params['shift_spacing'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_hadi_readout(nn, layer_sizes, network_params, c):
+    return HadiReadoutLayer(
+        scope='hadi_readout_layer_%i' % nn,
+        # this should be the case:
+        # nlags=network_params['time_expand'][nn],
+        # but since we don't have temporal side network we'll do this for now:
+        # nlags=None,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn + 1],
+        xy_out=network_params['xy_out'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_biconv(nn, layer_sizes, network_params, c):
+
+    conv_filter_size = _conv_filter_size(layer_sizes[nn], network_params['conv_filter_widths'][nn])
+    return BiConvLayer(
+        scope='biconv_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn+1],
+        filter_dims=conv_filter_size,
+        shift_spacing=network_params['shift_spacing'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_convLNL(nn, layer_sizes, network_params, c):
+
+    conv_filter_size = _conv_filter_size(
+        layer_sizes[nn], network_params['conv_filter_widths'][nn], fold_extra_dims=False)
+    return ConvLayerLNL(
+        scope='conv_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn+1],
+        filter_dims=conv_filter_size,
+        shift_spacing=network_params['shift_spacing'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_var(nn, layer_sizes, network_params, c):
+    layer_sizes[nn+1] = layer_sizes[nn]
+    norm_output = None
+    if 'normalize_output' in network_params:
+        norm_output = network_params['normalize_output'][nn]
+    return VariableLayer(
+        scope='var_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        normalize_output=norm_output,
+        log_activations=c.log_activations)
+
+
+def _build_biasreg(nn, layer_sizes, network_params, c):
+    if 'bias_reg_initializers' in network_params:
+        if isinstance(network_params['bias_reg_initializers'], list):
+            bias_reg = network_params['bias_reg_initializers'][nn]
+        else:
+            bias_reg = network_params['bias_reg_initializers']
+    else:
+        bias_reg = {}
+    return BiasRegLayer(
+        scope='biasreg_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        bias_reg_initializer=bias_reg,
+        normalize_output=network_params['normalize_output'][nn],
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_mask(nn, layer_sizes, network_params, c):
+    return MaskLayer(
+        scope='mask_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        output_dims=layer_sizes[nn+1],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        normalize_output=network_params['normalize_output'][nn],
+        num_inh=c.num_inh,
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+def _build_deconv(nn, layer_sizes, network_params, c):
+
+    conv_filter_size = _conv_filter_size(layer_sizes[nn], network_params['conv_filter_widths'][nn])
+    return DeconvLayer(
+        scope='deconv_layer_%i' % nn,
+        input_dims=layer_sizes[nn],
+        num_filters=layer_sizes[nn+1],
+        filter_dims=conv_filter_size,
+        shift_spacing=network_params['shift_spacing'][nn],
+        output_shape=network_params['output_shape'][nn],
+        activation_func=c.activation_func,
+        normalize_weights=c.normalize_weights,
+        weights_initializer=c.weights_initializer,
+        biases_initializer=c.biases_initializer,
+        reg_initializer=c.reg_initializer,
+        num_inh=c.num_inh,
+        normalize_output=network_params['normalize_output'][nn],
+        pos_constraint=c.pos_constraint,
+        log_activations=c.log_activations)
+
+
+# Maps each layer_types string to the function that constructs that layer
+_LAYER_BUILDERS = {
+    'normal': _build_normal,
+    'sep': _build_sep,
+    'readout': _build_readout,
+    'add': _build_add,
+    'mult': _build_mult,
+    'dim0': _build_dim0,
+    'filter': _build_filter,
+    'spkNL': _build_spkNL,
+    'spike_history': _build_spike_history,
+    'conv': _build_conv,
+    'conv_diff_of_gaussians': _build_conv_diff_of_gaussians,
+    'temporal': _build_temporal,
+    'sp_temporal': _build_sp_temporal,
+    'conv_readout': _build_conv_readout,
+    'diff_of_gaussians': _build_diff_of_gaussians,
+    'conv_xy': _build_conv_xy,
+    'convsep': _build_convsep,
+    'hadi_readout': _build_hadi_readout,
+    'biconv': _build_biconv,
+    'convLNL': _build_convLNL,
+    'var': _build_var,
+    'biasreg': _build_biasreg,
+    'mask': _build_mask,
+    'deconv': _build_deconv}
+
+
 
 class FFNetwork(object):
     """Implementation of simple fully-connected feed-forward neural network. 
@@ -80,6 +552,11 @@ class FFNetwork(object):
                 params_dict['log_activations'] (bool, optional): True to use, see
                     tf.summary on layer activations
                     DEFAULT = False
+                params_dict['xla_jit'] (bool, optional): True to compile the network graph
+                    with XLA, which fuses consecutive layer ops into single kernels. Best suited
+                    to fixed batch sizes and mostly 'normal'/'sep' layers; conv-heavy networks
+                    can be slower under XLA, so leave off for those.
+                    DEFAULT = False
 
         Raises:
             TypeError: If `scope` is not specified
@@ -133,556 +610,80 @@ class FFNetwork(object):
         # Define input masks -- but do not assign
         self.input_masks = [None] * self.num_layers
 
-        if 'activation_funcs' not in params_dict:
-            params_dict['activation_funcs'] = 'relu'
-        if type(params_dict['activation_funcs']) is not list:
-            params_dict['activation_funcs'] = \
-                [params_dict['activation_funcs']] * self.num_layers
-        elif len(params_dict['activation_funcs']) != self.num_layers:
-            raise ValueError('Invalid number of activation_funcs')
-
-        if 'weights_initializers' not in params_dict:
-            params_dict['weights_initializers'] = 'trunc_normal'
-        if type(params_dict['weights_initializers']) is not list:
-            params_dict['weights_initializers'] = \
-                [params_dict['weights_initializers']] * self.num_layers
-        elif len(params_dict['weights_initializers']) != self.num_layers:
-            raise ValueError('Invalid number of weights_initializer')
-
-        if 'biases_initializers' not in params_dict:
-            params_dict['biases_initializers'] = 'zeros'
-        if type(params_dict['biases_initializers']) is not list:
-            params_dict['biases_initializers'] = \
-                [params_dict['biases_initializers']] * self.num_layers
-        elif len(params_dict['biases_initializers']) != self.num_layers:
-            raise ValueError('Invalid number of biases_initializer')
+        # Scalar entries are replicated for all layers
+        for key, default in _SCALAR_DEFAULTS:
+            val = params_dict.get(key, default)
+            if not isinstance(val, list):
+                params_dict[key] = [val] * self.num_layers
+            elif len(val) != self.num_layers:
+                raise ValueError('Invalid number of %s' % key)
 
         if 'reg_initializers' not in params_dict:
             params_dict['reg_initializers'] = [None] * self.num_layers
 
-        if 'num_inh' not in params_dict:
-            params_dict['num_inh'] = 0
-        if type(params_dict['num_inh']) is not list:
-            params_dict['num_inh'] = [params_dict['num_inh']] * self.num_layers
-        elif len(params_dict['num_inh']) != self.num_layers:
-            raise ValueError('Invalid number of num_inh')
-
-        if 'pos_constraints' not in params_dict:
-            params_dict['pos_constraints'] = False
-        if type(params_dict['pos_constraints']) is not list:
-            params_dict['pos_constraints'] = [params_dict['pos_constraints']] * self.num_layers
-        elif len(params_dict['pos_constraints']) != self.num_layers:
-            raise ValueError('Invalid number of pos_con')
-
         if 'time_expand' not in params_dict:
             params_dict['time_expand'] = [0] * self.num_layers
 
         if 'log_activations' not in params_dict:
             params_dict['log_activations'] = False
 
+        if 'xla_jit' not in params_dict:
+            params_dict['xla_jit'] = False
+        self.xla_jit = params_dict['xla_jit']
+
         # Define network
         with tf.name_scope(self.scope):
             self._define_network(params_dict)
 
-        if params_dict['log_activations']:
-            self.log = True
-        else:
-            self.log = False
+        self.log = bool(params_dict['log_activations'])
     # END FFNetwork.__init__
 
     def _define_network(self, network_params):
 
         layer_sizes = [self.input_dims] + network_params['layer_sizes']
-        self.layers = []
+        self.layers = [None] * self.num_layers
         self.time_expand = network_params['time_expand'].copy()
         if len(self.time_expand) < self.num_layers:
             self.time_expand += [0]*(self.num_layers-len(self.time_expand))
-        self.time_spread = np.sum(self.time_expand)
+        # Computed before the loop so that lags handled internally by temporal layers (whose time_expand
+        # is zeroed below) still count towards the time_spread of the network
+        self.time_spread = sum(self.time_expand)
+
+        # Gather per-layer settings into one record per layer
+        configs = [
+            _LayerConfig(
+                activation_func=network_params['activation_funcs'][nn],
+                weights_initializer=network_params['weights_initializers'][nn],
+                biases_initializer=network_params['biases_initializers'][nn],
+                reg_initializer=network_params['reg_initializers'][nn],
+                num_inh=network_params['num_inh'][nn],
+                pos_constraint=network_params['pos_constraints'][nn],
+                normalize_weights=network_params['normalize_weights'][nn],
+                num_lags=self.time_expand[nn],
+                log_activations=network_params['log_activations'])
+            for nn in range(self.num_layers)]
 
         for nn in range(self.num_layers):
 
             # Augment layer_sizes to take into account output of convolutional layers
             if nn > 0:
-                layer_sizes[nn] = deepcopy(self.layers[nn-1].output_dims)
+                layer_sizes[nn] = list(self.layers[nn-1].output_dims)
 
-            # Add time lags to input dimensions if time_expand
+            # Add time lags to input dimensions if time_expand (layer input sizes are always lists here:
+            # input_dims is formatted in __init__, and layers store output_dims as lists)
             if self.time_expand[nn] > 0:
-                if not isinstance(layer_sizes[nn], list):
-                    layer_sizes[nn] = [layer_sizes[nn], 1, 1]
                 layer_sizes[nn] += [self.time_expand[nn]]  # add number of lags to input dimesions
 
-            if self.layer_types[nn] == 'normal':
-
-                self.layers.append(Layer(
-                    scope='layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'sep':
-
-                self.layers.append(SepLayer(
-                    scope='sep_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'readout':
-
-                self.layers.append(ReadoutLayer(
-                    scope='readout_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn + 1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'add':
-
-                self.layers.append(AddLayer(
-                    scope='add_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'mult':
-
-                self.layers.append(MultLayer(
-                    scope='mult_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'dim0':
-
-                self.layers.append(Dim0Layer(
-                    scope='dim0_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'filter':
-
-                self.layers.append(FilterLayer(
-                    scope='add_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-                #if nn < self.num_layers:
-                #    layer_sizes[nn+1] = deepcopy(self.layers[nn].output_dims)
-
-            elif self.layer_types[nn] == 'spkNL':
-
-                self.layers.append(SpkNL_Layer(
-                    scope='spkNL_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'spike_history':
-
-                self.layers.append(SpikeHistoryLayer(
-                    scope='spike_history_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'conv' or self.layer_types[nn] == 'conv_diff_of_gaussians':
-
-                if network_params['conv_filter_widths'][nn] is None:
-                    conv_filter_size = layer_sizes[nn]
-                else:
-                    if len(layer_sizes[nn]) > 3:
-                        dim0size = layer_sizes[nn][0]*np.prod(layer_sizes[nn][3:])
-                    else:
-                        dim0size = layer_sizes[nn][0]
-
-                    conv_filter_size = [dim0size, network_params['conv_filter_widths'][nn], 1]
-                    if layer_sizes[nn][2] > 1:
-                        conv_filter_size[2] = network_params['conv_filter_widths'][nn]
-
-                if self.layer_types[nn] == 'conv':
-                    self.layers.append(ConvLayer(
-                        scope='conv_layer_%i' % nn,
-                        input_dims=layer_sizes[nn],
-                        num_filters=layer_sizes[nn+1],
-                        filter_dims=conv_filter_size,
-                        shift_spacing=network_params['shift_spacing'][nn],
-                        activation_func=network_params['activation_funcs'][nn],
-                        normalize_weights=network_params['normalize_weights'][nn],
-                        weights_initializer=network_params['weights_initializers'][nn],
-                        biases_initializer=network_params['biases_initializers'][nn],
-                        reg_initializer=network_params['reg_initializers'][nn],
-                        num_inh=network_params['num_inh'][nn],
-                        pos_constraint=network_params['pos_constraints'][nn],
-                        log_activations=network_params['log_activations']))
-                elif self.layer_types[nn] == 'conv_diff_of_gaussians':
-                    self.layers.append(ConvDiffOfGaussiansLayer(
-                        scope='conv_dog_layer_%i' % nn,
-                        input_dims=layer_sizes[nn],
-                        num_filters=layer_sizes[nn+1],
-                        bounds=network_params['bounds'][nn] if 'bounds' in network_params else None,
-                        filter_dims=conv_filter_size,
-                        shift_spacing=network_params['shift_spacing'][nn],
-                        activation_func=network_params['activation_funcs'][nn],
-                        weights_initializer=network_params['weights_initializers'][nn],
-                        biases_initializer=network_params['biases_initializers'][nn],
-                        num_inh=network_params['num_inh'][nn],
-                        log_activations=network_params['log_activations']))
-
-                # Modify output size to take into account shifts
-                #if nn < self.num_layers:
-                #    layer_sizes[nn+1] = self.layers[nn].output_dims.copy()
-
-            elif self.layer_types[nn] == 'temporal':
-                self.layers.append(TLayer(
-                    scope='temporal_layer_%i' % nn,
-                    num_lags=self.time_expand[nn],
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn + 1],
-                    dilation=network_params['dilation'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-                # Cancel time-expansion because handled internally
-                self.time_expand[nn] = 0
-                # Modify output size to take into account shifts
-                #if nn < self.num_layers:
-                #    layer_sizes[nn+1] = self.layers[nn].output_dims
-
-            elif self.layer_types[nn] == 'sp_temporal':
-                
-                self.layers.append(TLayerSpecific(
-                    scope='sp_temporal_layer_%i' % nn,
-                    num_lags=self.time_expand[nn],
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn + 1],
-                    dilation=network_params['dilation'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
+            if self.layer_types[nn] not in _LAYER_BUILDERS:
+                raise TypeError('Layer type %i not defined.' % nn)
+            self.layers[nn] = \
+                _LAYER_BUILDERS[self.layer_types[nn]](nn, layer_sizes, network_params, configs[nn])
 
+            if self.layer_types[nn] in ('temporal', 'sp_temporal'):
                 # Cancel time-expansion because handled internally
                 self.time_expand[nn] = 0
 
-            elif self.layer_types[nn] == 'conv_readout':
-
-                self.layers.append(ConvReadoutLayer(
-                    scope='conv_readout_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn + 1],
-                    xy_out=network_params['xy_out'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'diff_of_gaussians':
-                self.layers.append(DiffOfGaussiansLayer(
-                    scope='diff_of_gaussians_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn + 1],              
-                    bounds=network_params['bounds'][nn] if 'bounds' in network_params else None,
-                    activation_func=network_params['activation_funcs'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    log_activations=network_params['log_activations']))
-            elif self.layer_types[nn] == 'conv_xy':
-
-                if network_params['conv_filter_widths'][nn] is not None:
-                    width = network_params['conv_filter_widths'][nn]
-                    conv_filter_size = [layer_sizes[nn][0], width, width]
-                else:
-                    conv_filter_size = layer_sizes[nn]
-
-                self.layers.append(ConvXYLayer(
-                    scope='conv_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn + 1],
-                    filter_dims=conv_filter_size,
-                    xy_out=network_params['xy_out'][nn],
-                    shift_spacing=network_params['shift_spacing'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-                # Modify output size to take into account shifts
-                #if nn < self.num_layers:
-                #    layer_sizes[nn + 1] = self.layers[nn].output_dims.copy()
-
-            elif self.layer_types[nn] == 'convsep':
-
-                if network_params['conv_filter_widths'][nn] is None:
-                    conv_filter_size = layer_sizes[nn]
-                else:
-                    conv_filter_size = [
-                        layer_sizes[nn][0],
-                        network_params['conv_filter_widths'][nn], 1]
-                    if layer_sizes[nn][2] > 1:
-                        conv_filter_size[2] = \
-                            network_params['conv_filter_widths'][nn]
-
-                self.layers.append(ConvSepLayer(
-                    scope='sepconv_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn+1],
-                    filter_dims=conv_filter_size,
-                    shift_spacing=network_params['shift_spacing'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-                # Modify output size to take into account shifts
-                #if nn < self.num_layers:
-                #    layer_sizes[nn+1] = self.layers[nn].output_dims.copy()
-
-            elif self.layer_types[nn] == 'hadi_readout':
-
-                self.layers.append(HadiReadoutLayer(
-                    scope='hadi_readout_layer_%i' % nn,
-                    # this should be the case:
-                    # nlags=network_params['time_expand'][nn],
-                    # but since we don't have temporal side network we'll do this for now:
-                    # nlags=None,
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn + 1],
-                    xy_out=network_params['xy_out'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-                # Modify output size to take into account shifts
-                #if nn < self.num_layers:
-                #    layer_sizes[nn + 1] = self.layers[nn].output_dims
-
-            elif self.layer_types[nn] == 'biconv':
-
-                if network_params['conv_filter_widths'][nn] is None:
-                    conv_filter_size = layer_sizes[nn]
-                else:
-                    # print(self.layer_types[nn], layer_sizes[nn])
-                    if len(layer_sizes[nn]) > 3:
-                        dim0size = layer_sizes[nn][0]*np.prod(layer_sizes[nn][3:])
-                    else:
-                        dim0size = layer_sizes[nn][0]
-
-                    conv_filter_size = [dim0size, network_params['conv_filter_widths'][nn], 1]
-                    if layer_sizes[nn][2] > 1:
-                        conv_filter_size[2] = network_params['conv_filter_widths'][nn]
-
-                self.layers.append(BiConvLayer(
-                    scope='biconv_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn+1],
-                    filter_dims=conv_filter_size,
-                    shift_spacing=network_params['shift_spacing'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-                # Modify output size to take into account shifts
-                #if nn < self.num_layers:
-                #    layer_sizes[nn+1] = self.layers[nn].output_dims.copy()
-
-            elif self.layer_types[nn] == 'convLNL':
-
-                if network_params['conv_filter_widths'][nn] is None:
-                    conv_filter_size = layer_sizes[nn]
-                else:
-                    conv_filter_size = [
-                        layer_sizes[nn][0],
-                        network_params['conv_filter_widths'][nn], 1]
-                    if layer_sizes[nn][2] > 1:
-                        conv_filter_size[2] = \
-                            network_params['conv_filter_widths'][nn]
-
-                self.layers.append(ConvLayerLNL(
-                    scope='conv_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn+1],
-                    filter_dims=conv_filter_size,
-                    shift_spacing=network_params['shift_spacing'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'var':
-                layer_sizes[nn+1] = layer_sizes[nn]
-                norm_output = None
-                if 'normalize_output' in network_params:
-                    norm_output = network_params['normalize_output'][nn]
-                self.layers.append(VariableLayer(
-                    scope='var_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    normalize_output=norm_output,
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'biasreg':
-                if 'bias_reg_initializers' in network_params:
-                    if isinstance(network_params['bias_reg_initializers'],list):
-                        bias_reg = network_params['bias_reg_initializers'][nn]
-                    else:
-                        bias_reg = network_params['bias_reg_initializers']
-                else:
-                    bias_reg = {}
-                self.layers.append(BiasRegLayer(
-                    scope='biasreg_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    bias_reg_initializer=bias_reg,
-                    normalize_output=network_params['normalize_output'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'mask':
-                self.layers.append(MaskLayer(
-                    scope='mask_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    output_dims=layer_sizes[nn+1],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    normalize_output=network_params['normalize_output'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            elif self.layer_types[nn] == 'deconv':
-
-                if network_params['conv_filter_widths'][nn] is None:
-                    conv_filter_size = layer_sizes[nn]
-                else:
-                    if len(layer_sizes[nn]) > 3:
-                        dim0size = layer_sizes[nn][0]*np.prod(layer_sizes[nn][3:])
-                    else:
-                        dim0size = layer_sizes[nn][0]
-
-                    conv_filter_size = [dim0size, network_params['conv_filter_widths'][nn], 1]
-                    if layer_sizes[nn][2] > 1:
-                        conv_filter_size[2] = network_params['conv_filter_widths'][nn]
-                
-                self.layers.append(DeconvLayer(
-                    scope='deconv_layer_%i' % nn,
-                    input_dims=layer_sizes[nn],
-                    num_filters=layer_sizes[nn+1],
-                    filter_dims=conv_filter_size,
-                    shift_spacing=network_params['shift_spacing'][nn],
-                    output_shape=network_params['output_shape'][nn],
-                    activation_func=network_params['activation_funcs'][nn],
-                    normalize_weights=network_params['normalize_weights'][nn],
-                    weights_initializer=network_params['weights_initializers'][nn],
-                    biases_initializer=network_params['biases_initializers'][nn],
-                    reg_initializer=network_params['reg_initializers'][nn],
-                    num_inh=network_params['num_inh'][nn],
-                    normalize_output=network_params['normalize_output'][nn],
-                    pos_constraint=network_params['pos_constraints'][nn],
-                    log_activations=network_params['log_activations']))
-
-            else:
-                raise TypeError('Layer type %i not defined.' % nn)
-            print(f'layer {nn}: ',self.layers[-1].output_dims)
+            print(f'layer {nn}: ',self.layers[nn].output_dims)
     # END FFNetwork._define_network
 
     def build_fit_variable_list(self, fit_parameter_list):
@@ -700,7 +701,7 @@ class FFNetwork(object):
     def build_graph(self, inputs, params_dict=None, batch_size=None, use_dropout=False):
         """Build tensorflow graph for this network"""
 
-        with tf.name_scope(self.scope):
+        with tf.name_scope(self.scope), self._jit_scope():
             for layer in range(self.num_layers):
                 if self.time_expand[layer] > 0:
                     self.layers[layer].build_graph(
@@ -712,11 +713,21 @@ class FFNetwork(object):
 
     # END FFNetwork._build_graph
 
+    def _jit_scope(self):
+        """Returns XLA jit scope for graph-building if xla_jit is set, and an empty context otherwise"""
+        # networks pickled (NDN.save_model) before xla_jit was added will not have the attribute
+        if getattr(self, 'xla_jit', False):
+            return tf.contrib.compiler.jit.experimental_jit_scope()
+        return ExitStack()
+
     def assign_model_params(self, sess):
-        """Read weights/biases in numpy arrays into tf Variables"""
-        with tf.name_scope(self.scope):
-            for layer in range(self.num_layers):
-                self.layers[layer].assign_layer_params(sess)
+        """Read weights/biases in numpy arrays into tf Variables (all layers in one session call)"""
+        init_ops, feed_dict = [], {}
+        for layer in range(self.num_layers):
+            layer_ops, layer_feed = self.layers[layer].layer_params_feed()
+            init_ops += layer_ops
+            feed_dict.update(layer_feed)
+        sess.run(init_ops, feed_dict=feed_dict)
 
     def write_model_params(self, sess):
         """Write weights/biases in tf Variables to numpy arrays"""
@@ -726,15 +737,21 @@ class FFNetwork(object):
     def copy_ffnetwork_params(self, origin_network):
         """Copy ffnetwork parameters over to new network (which is self in this case). 
         Only should be called by NDN.copy_model(), and assumes copy of ffnetwork has same number of layers."""
-        self.input_masks = deepcopy(origin_network.input_masks)
+        # numpy masks are copied directly, rather than through deepcopy
+        self.input_masks = [mask.copy() if isinstance(mask, np.ndarray) else deepcopy(mask)
+                            for mask in origin_network.input_masks]
         for layer in range(self.num_layers):
             self.layers[layer].copy_layer_params( origin_network.layers[layer])
 
     def assign_reg_vals(self, sess):
-        """Update default tf Graph with new regularization penalties"""
-        with tf.name_scope(self.scope):
-            for layer in range(self.num_layers):
-                self.layers[layer].assign_reg_vals(sess)
+        """Update default tf Graph with new regularization penalties (all layers in one session call)"""
+        init_ops, feed_dict = [], {}
+        for layer in range(self.num_layers):
+            layer_ops, layer_feed = self.layers[layer].reg_vals_feed()
+            init_ops += layer_ops
+            feed_dict.update(layer_feed)
+        if len(init_ops) > 0:
+            sess.run(init_ops, feed_dict=feed_dict)
 
     def define_regularization_loss(self):
         """Build regularization loss portion of default tf graph"""
@@ -757,18 +774,16 @@ class FFNetwork(object):
 
     @staticmethod
     def time_embed(inputs, batch_sz, num_lags):
-        """Makes time-embedded input via matrix transformation"""
-        m = np.zeros((batch_sz, num_lags, batch_sz))
-        for lag in range(num_lags):
-            m[:, lag, :] = np.eye(batch_sz, k=-lag)
+        """Makes time-embedded input by stacking zero-padded, time-shifted copies of the inputs"""
 
         with tf.name_scope('time_embedding'):
-            # tmat = get_tmat(batch_sz=batch_sz, num_lags=nlags)
-            tmat = tf.constant(m, dtype=tf.float32, name='tmat')
+            # Pad start of batch with zeros, so that lag k of time t is padded_inputs[t + num_lags-1 - k]
+            padded_inputs = tf.pad(inputs, [[num_lags-1, 0], [0, 0]])
+            lagged_inputs = [padded_inputs[(num_lags-1-lag):(num_lags-1-lag+batch_sz), :]
+                             for lag in range(num_lags)]
 
-            expanded_inputs = tf.tensordot(tmat, inputs, axes=[2, 0])
-            expanded_inputs_tr = tf.transpose(expanded_inputs, [0, 2, 1])
-            expanded_inputs = tf.reshape(expanded_inputs_tr, (batch_sz, -1))
+            # Lags are the fastest-changing dimension: [batch_sz, num_inputs, num_lags]
+            expanded_inputs = tf.reshape(tf.stack(lagged_inputs, axis=2), (batch_sz, -1))
 
         return expanded_inputs
 
@@ -824,23 +839,22 @@ class SideNetwork(FFNetwork):
         input_layer_sizes = input_network_params['layer_sizes'][:]
         # Check if entire network is convolutional (then will have spatial input dims)
         all_convolutional = False
-        nonconv_inputs = np.zeros(len(input_layer_sizes), dtype=int)
-        if input_network_params['layer_types'][0] in _conv_types:
+        input_layer_types = np.array(input_network_params['layer_types'][:len(input_layer_sizes)])
+        is_conv = np.in1d(input_layer_types, _conv_types)
+        if is_conv[0]:
             # then check that all are conv
-            all_convolutional = True
-            for nn in range(len(input_layer_sizes)):
-                if input_network_params['layer_types'][nn] in _conv_types:
-                    nonconv_inputs[nn] = input_layer_sizes[nn] * input_network_params['input_dims'][1] *\
-                                         input_network_params['input_dims'][2]
-                    if input_network_params['layer_types'][nn] == 'biconv':
-                        isbinocular = True
-                        # then twice as many outputs as filters
-                        nonconv_inputs[nn] *= 2
-                else:
-                    all_convolutional = False
-                    nonconv_inputs[nn] = input_layer_sizes[nn]
+            all_convolutional = bool(np.all(is_conv))
+            # conv layers output every spatial position (and biconv twice as many outputs as filters)
+            is_biconv = input_layer_types == 'biconv'
+            isbinocular = bool(np.any(is_biconv))
+            num_input_space = input_network_params['input_dims'][1] * input_network_params['input_dims'][2]
+            nonconv_inputs = np.where(
+                is_conv,
+                np.asarray(input_layer_sizes) * num_input_space * np.where(is_biconv, 2, 1),
+                input_layer_sizes)
         else:
             nonconv_inputs = input_layer_sizes[:]
+        nonconv_inputs = np.asarray(nonconv_inputs, dtype=np.int64)
 
         if all_convolutional:
             nx_ny = input_network_params['input_dims'][1:]
@@ -858,7 +872,7 @@ class SideNetwork(FFNetwork):
         else:
             nx_ny = [1, 1]
             #input_dims = [len(input_layer_sizes), max(nonconv_inputs), 1]
-            input_dims = [np.sum(nonconv_inputs), 1, 1]
+            input_dims = [int(nonconv_inputs.sum()), 1, 1]
 
         super(SideNetwork, self).__init__(
             scope=scope,
@@ -870,6 +884,8 @@ class SideNetwork(FFNetwork):
             self.num_units = input_layer_sizes
         else:
             self.num_units = nonconv_inputs
+        # Total number of inputs once all input layers are assembled
+        self._flat_units = int(np.sum(self.num_units)) * self.num_space
 
         # Set up potential side_network regularization (in first layer)
         self.layers[0].reg.scaffold_setup(self.num_units)
@@ -881,9 +897,13 @@ class SideNetwork(FFNetwork):
         can be assembled here"""
 
         num_layers = len(self.num_units)
-        with tf.name_scope(self.scope):
+        if not hasattr(self, '_flat_units'):  # side networks pickled before it was set in __init__
+            self._flat_units = int(np.sum(self.num_units)) * self.num_space
+
+        with tf.name_scope(self.scope), self._jit_scope():
 
             # Assemble network-inputs into the first layer
+            input_slices = []
             for input_nn in range(num_layers):
 
                 if (self.num_space == 1) or \
@@ -892,25 +912,19 @@ class SideNetwork(FFNetwork):
                                            [-1, self.num_space, self.num_units[input_nn]])
 
                 else:  # spatial positions converted to different filters (binocular)
-                    native_space = np.prod(input_network.layers[input_nn].output_dims[1:3])
                     native_filters = input_network.layers[input_nn].output_dims[0]
+                    # Split space into [left, right] halves, and move eye next to the filter dimension
                     tmp = tf.reshape(input_network.layers[input_nn].outputs,
-                                           [-1, 1, native_space, native_filters])
-                    # Reslice into correct spatial arrangement
-                    left_post = tf.slice(tmp, [0, 0, 0, 0], [-1, -1, self.num_space, -1])
-                    right_post = tf.slice(tmp, [0, 0, self.num_space, 0],
-                                          [-1, -1, self.num_space, -1])
-
-                    new_slice = tf.reshape(tf.concat([left_post, right_post], axis=3),
+                                     [-1, 2, self.num_space, native_filters])
+                    new_slice = tf.reshape(tf.transpose(tmp, [0, 2, 1, 3]),
                                            [-1, self.num_space, self.num_units[input_nn]])
 
-                if input_nn == 0:
-                    inputs_raw = new_slice
-                else:
-                    inputs_raw = tf.concat([inputs_raw, new_slice], 2)
+                input_slices.append(new_slice)
+
+            inputs_raw = tf.concat(input_slices, 2)
 
             # Need to put layer dimension with the filters as bottom dimension instead of top
-            inputs = tf.reshape(inputs_raw, [-1, np.sum(self.num_units)*self.num_space])
+            inputs = tf.reshape(inputs_raw, [-1, self._flat_units])
             #inputs = tf.reshape(inputs_raw, [-1, num_layers*max_units*self.num_space])
 
             # Now standard graph-build (could just call the parent with inputs)
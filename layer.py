@@ -340,6 +340,13 @@ class Layer(object):
 
     def assign_layer_params(self, sess):
         """Read weights/biases in numpy arrays into tf Variables"""
+        init_ops, feed_dict = self.layer_params_feed()
+        sess.run(init_ops, feed_dict=feed_dict)
+    # END Layer.assign_layer_params
+
+    def layer_params_feed(self):
+        """Returns the Variable initializers and feed_dict that read weights/biases in numpy arrays
+        into tf Variables, so that FFNetwork can assign all layers in one session call"""
 
         # Adjust weights (pos and normalize) if appropriate
         if self.pos_constraint is not None:
@@ -349,11 +356,9 @@ class Layer(object):
         elif self.normalize_weights < 0:
             self.weights = np.divide(self.weights, np.maximum(np.sqrt(np.sum(np.square(self.weights), axis=0)), 1))
 
-        sess.run(
-            [self.weights_var.initializer, self.biases_var.initializer],
-            feed_dict={self.weights_ph: self.weights,
-                       self.biases_ph: self.biases})
-    # END Layer.assign_layer_params
+        return [self.weights_var.initializer, self.biases_var.initializer], \
+            {self.weights_ph: self.weights, self.biases_ph: self.biases}
+    # END Layer.layer_params_feed
 
     def write_layer_params(self, sess):
         """Write weights/biases in tf Variables to numpy arrays"""
@@ -412,7 +417,13 @@ class Layer(object):
 
     def assign_reg_vals(self, sess):
         """Wrapper function for assigning regularization values"""
-        self.reg.assign_reg_vals(sess)
+        init_ops, feed_dict = self.reg_vals_feed()
+        if len(init_ops) > 0:
+            sess.run(init_ops, feed_dict=feed_dict)
+
+    def reg_vals_feed(self):
+        """Wrapper function for gathering regularization value initializers and feed_dict"""
+        return self.reg.reg_vals_feed()
 
     def get_reg_pen(self, sess):
         """Wrapper function for returning regularization penalty dict"""
@@ -1545,23 +1556,18 @@ class SepLayer(Layer):
             self.ei_mask_var = None
     # END SepLayer._define_layer_variables
 
-    def assign_layer_params(self, sess):
-        """Read weights/biases in numpy arrays into tf Variables"""
+    def layer_params_feed(self):
+        """Returns Variable initializers and feed_dict for reading weights/biases into tf Variables,
+        with only the part of the weights being fit (partial_fit) fed in"""
         if self.partial_fit == 0:
-            wt = self.weights[:self.input_dims[0], :]
-            sess.run(
-                [self.weights_var.initializer, self.biases_var.initializer],
-                feed_dict={self.weights_ph: wt, self.biases_ph: self.biases})
+            weights = self.weights[:self.input_dims[0], :]
         elif self.partial_fit == 1:
-            ws = self.weights[self.input_dims[0]:, :]
-            sess.run(
-                [self.weights_var.initializer, self.biases_var.initializer],
-                feed_dict={self.weights_ph: ws, self.biases_ph: self.biases})
+            weights = self.weights[self.input_dims[0]:, :]
         else:
-            sess.run(
-                [self.weights_var.initializer, self.biases_var.initializer],
-                feed_dict={self.weights_ph: self.weights, self.biases_ph: self.biases})
-    # END SepLayer.assign_layer_params
+            weights = self.weights
+        return [self.weights_var.initializer, self.biases_var.initializer], \
+            {self.weights_ph: weights, self.biases_ph: self.biases}
+    # END SepLayer.layer_params_feed
 
     def write_layer_params(self, sess):
         """Write weights/biases in tf Variables to numpy arrays"""
@@ -1900,23 +1906,18 @@ class ConvSepLayer(Layer):
             self.ei_mask_var = None
     # END ConvSepLayer._define_layer_variables
 
-    def assign_layer_params(self, sess):
-        """Read weights/biases in numpy arrays into tf Variables"""
+    def layer_params_feed(self):
+        """Returns Variable initializers and feed_dict for reading weights/biases into tf Variables,
+        with only the part of the weights being fit (partial_fit) fed in"""
         if self.partial_fit == 0:
-            wt = self.weights[:self.input_dims[0], :]
-            sess.run(
-                [self.weights_var.initializer, self.biases_var.initializer],
-                feed_dict={self.weights_ph: wt, self.biases_ph: self.biases})
+            weights = self.weights[:self.input_dims[0], :]
         elif self.partial_fit == 1:
-            ws = self.weights[self.input_dims[0]:, :]
-            sess.run(
-                [self.weights_var.initializer, self.biases_var.initializer],
-                feed_dict={self.weights_ph: ws, self.biases_ph: self.biases})
+            weights = self.weights[self.input_dims[0]:, :]
         else:
-            sess.run(
-                [self.weights_var.initializer, self.biases_var.initializer],
-                feed_dict={self.weights_ph: self.weights, self.biases_ph: self.biases})
-    # END ConvSepLayer.assign_layer_params
+            weights = self.weights
+        return [self.weights_var.initializer, self.biases_var.initializer], \
+            {self.weights_ph: weights, self.biases_ph: self.biases}
+    # END ConvSepLayer.layer_params_feed
 
     def write_layer_params(self, sess):
         """Write weights/biases in tf Variables to numpy arrays"""
@@ -3442,9 +3443,11 @@ class BiasRegLayer(Layer):
         b_reg = self.bias_reg.define_reg_loss(self.biases_var)
         return tf.add(w_reg,b_reg)
 
-    def assign_reg_vals(self, sess):
-        super().assign_reg_vals(sess)
-        self.bias_reg.assign_reg_vals(sess)
+    def reg_vals_feed(self):
+        init_ops, feed_dict = super().reg_vals_feed()
+        bias_ops, bias_feed = self.bias_reg.reg_vals_feed()
+        feed_dict.update(bias_feed)
+        return init_ops + bias_ops, feed_dict
 
     def convert_to_unit_regularization( self ):
         super().convert_to_unit_regularization()
@@ -117,17 +117,19 @@ class Regularization(object):
 
     def assign_reg_vals(self, sess):
         """Update regularization values in default tf Graph"""
-        # loop through all types of regularization
-        #for reg_type, reg_val in self.vals.iteritems():  # python3 mod
-        for reg_type in self.vals:
-            reg_val = self.vals[reg_type]
-            # only assign if applicable
-            if reg_val is not None:
-                sess.run(
-                    self.vals_var[reg_type].initializer,
-                    feed_dict={self.vals_ph[reg_type]: self.vals[reg_type]})
+        init_ops, feed_dict = self.reg_vals_feed()
+        if len(init_ops) > 0:
+            sess.run(init_ops, feed_dict=feed_dict)
     # END Regularization.assign_reg_vals
 
+    def reg_vals_feed(self):
+        """Returns the Variable initializers and feed_dict that assign all applicable
+        regularization values, so that they can be assigned in one session call"""
+        reg_types = [reg_type for reg_type in self.vals if self.vals[reg_type] is not None]
+        return [self.vals_var[reg_type].initializer for reg_type in reg_types], \
+            {self.vals_ph[reg_type]: self.vals[reg_type] for reg_type in reg_types}
+    # END Regularization.reg_vals_feed
+
     def define_reg_loss(self, weights):
         """Define regularization loss in default tf Graph"""
 